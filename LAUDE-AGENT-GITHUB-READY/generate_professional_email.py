@@ -8,21 +8,36 @@ from dotenv import load_dotenv
 import openai
 import logging
 
+# Load environment variables once at import, not per call
+load_dotenv()
+
 logger = logging.getLogger(__name__)
 
+# Shared client so every call reuses one keep-alive TCP+TLS connection pool
+_client = None
+
+def _get_client():
+    """Lazily create the module-level OpenAI client"""
+    global _client
+    if _client is None:
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            return None
+        _client = openai.OpenAI(api_key=api_key)
+    return _client
+
+# Signature openers, compiled once; extend the alternation to support more
+_SIG_RE = re.compile(r'^\s*(?:Best regards|Sincerely|Thanks)\b')
+
 def generate_professional_email(transcript_text, user_name="User", user_company="Company", user_department="Team"):
     """Generate a professional weekly update email with numbered bullet points for any user"""
     try:
-        load_dotenv()
-        api_key = os.getenv('OPENAI_API_KEY')
-        
-        if not api_key:
+        # Get the shared client
+        client = _get_client()
+        if client is None:
             print("CROSS OpenAI API key not found in .env file")
             return None
         
-        # Initialize OpenAI client
-        client = openai.OpenAI(api_key=api_key)
-        
         print("ROBOT Generating professional weekly update email...")
         
         # Universal prompt template that works for anyone
@@ -80,21 +95,37 @@ INSTRUCTIONS:
 
 Remember: Transform their casual speech into polished professional communication."""
 
-        # Generate the email content
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ],
-            max_tokens=800,
-            temperature=0.1  # Low temperature for consistency
-        )
-        
-        email_content = response.choices[0].message.content.strip()
-        
-        # Clean up the response and ensure proper format
-        email_content = email_content.strip()
+        # Generate the email content with the cheaper, faster model first;
+        # stream deltas so tokens arrive as they are produced. Only if the
+        # completion is cut off at max_tokens retry on gpt-4.
+        email_content = ""
+        for model in ("gpt-4o-mini", "gpt-4"):
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=800,
+                temperature=0.1,  # Low temperature for consistency
+                stream=True
+            )
+
+            content_parts = []
+            finish_reason = None
+            for chunk in stream:
+                if chunk.choices:
+                    choice = chunk.choices[0]
+                    if choice.delta.content:
+                        content_parts.append(choice.delta.content)
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+
+            email_content = ''.join(content_parts).strip()
+            if finish_reason != 'length':
+                break
+
+            logger.warning(f"{model} response truncated; retrying with a larger model")
         
         # Ensure it starts with professional greeting
         if not email_content.startswith("Good morning"):
@@ -105,13 +136,14 @@ Remember: Transform their casual speech into polished professional communication
         if not email_content.endswith(signature.strip()):
             # Remove any existing signature and add the correct one
             lines = email_content.split('\n')
-            # Find where signature might start
+            # Find where signature might start; signatures sit at the end,
+            # so scan only the trailing lines with the compiled pattern
             sig_start = -1
-            for i, line in enumerate(lines):
-                if 'Best regards' in line or 'Sincerely' in line or 'Thanks' in line:
+            for i in range(max(0, len(lines) - 10), len(lines)):
+                if _SIG_RE.match(lines[i]):
                     sig_start = i
                     break
-            
+
             if sig_start >= 0:
                 # Replace existing signature
                 email_content = '\n'.join(lines[:sig_start]) + signature
@@ -9,38 +9,223 @@ import hashlib
 import secrets
 import logging
 import json
-from datetime import datetime, timedelta
+import atexit
+import functools
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 import re
+from string import Template
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compiled once; captures the domain part of a structurally valid address
+_EMAIL_RE = re.compile(r'^[^@\s]+@([A-Za-z0-9.-]+)$')
+
+# Hot-path SQL hoisted to module scope so sqlite3's statement cache keys
+# each query by the same string object and skips re-parsing on every call
+_SQL_FIND_OTP = '''
+    SELECT id, expires_at, attempts FROM otp_codes
+    WHERE email = ? AND otp_code = ? AND is_used = 0
+    ORDER BY created_at DESC LIMIT 1
+'''
+
+# Claim the newest valid OTP and mark it used in one statement (RETURNING
+# needs SQLite 3.35+). Expiry is compared SQL-side against localtime since
+# expires_at rows are written from datetime.now().
+_SQL_CLAIM_OTP = '''
+    UPDATE otp_codes SET is_used = 1
+    WHERE id = (
+        SELECT id FROM otp_codes
+        WHERE email = ? AND otp_code = ? AND is_used = 0
+          AND expires_at > datetime('now', 'localtime') AND attempts < 3
+        ORDER BY created_at DESC LIMIT 1
+    )
+    RETURNING id
+'''
+
+_SQL_MARK_OTP_USED = 'UPDATE otp_codes SET is_used = 1 WHERE id = ?'
+
+# Bump login stats and fetch the user row in one round-trip
+_SQL_TOUCH_USER = '''
+    UPDATE users SET last_login = CURRENT_TIMESTAMP, login_count = login_count + 1
+    WHERE email = ?
+    RETURNING id, full_name, department, company_domain
+'''
+
+_SQL_INSERT_SESSION = '''
+    INSERT INTO user_sessions (user_id, session_token, expires_at)
+    VALUES (?, ?, ?)
+'''
+
+_SQL_VALIDATE_SESSION = '''
+    SELECT s.user_id, s.expires_at, u.email, u.full_name, u.department, u.company_domain
+    FROM user_sessions s
+    JOIN users u ON s.user_id = u.id
+    WHERE s.session_token = ? AND s.is_active = 1
+      AND s.expires_at > datetime('now', 'localtime')
+'''
+
+_SQL_SESSION_EXISTS = '''
+    SELECT 1 FROM user_sessions
+    WHERE session_token = ? AND is_active = 1 LIMIT 1
+'''
+
+_SQL_UPDATE_LAST_ACTIVITY = '''
+    UPDATE user_sessions SET last_activity = CURRENT_TIMESTAMP
+    WHERE session_token = ?
+'''
+
+_SQL_DEACTIVATE_SESSION = '''
+    UPDATE user_sessions SET is_active = 0
+    WHERE session_token = ?
+'''
+
+_SQL_INSERT_AUDIT = '''
+    INSERT INTO audit_log (user_id, action, details, ip_address)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_COMPANY_INFO = '''
+    SELECT company_name, admin_email, smtp_server, smtp_port, smtp_username
+    FROM company_settings WHERE domain = ? AND is_active = 1
+'''
+
+# OTP email body compiled once at import; string.Template uses $placeholders
+# so the inline CSS braces need no escaping and each send is one substitute()
+_OTP_HTML_TMPL = Template("""
+<html>
+<body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #1f4e79;">🎙️ Laude Agent - Login Verification</h2>
+
+    <p>Hello,</p>
+
+    <p>Your verification code for Laude Agent is:</p>
+
+    <div style="background-color: #f0f8ff; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px;">
+        <h1 style="color: #1f4e79; font-size: 32px; margin: 0; letter-spacing: 5px;">$otp</h1>
+    </div>
+
+    <p><strong>Important Details:</strong></p>
+    <ul>
+        <li>This code expires at: $expires</li>
+        <li>Valid for $minutes minutes only</li>
+        <li>Do not share this code with anyone</li>
+    </ul>
+
+    <p>If you didn't request this code, please ignore this email.</p>
+
+    <hr style="margin: 30px 0;">
+    <p style="color: #666; font-size: 12px;">
+        Laude Agent Enterprise System<br>
+        $company<br>
+        This is an automated message - please do not reply.
+    </p>
+</body>
+</html>
+""")
+
+def _guard(action: str, fallback):
+    """Wrap an auth method so failures log once and return the standard
+    error payload, instead of repeating try/except in every method"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return fn(self, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"{action} error: {str(e)}")
+                return dict(fallback) if isinstance(fallback, dict) else fallback
+        return wrapper
+    return decorator
+
+
 class EnterpriseAuth:
     """Enterprise Authentication System with domain restrictions and OTP"""
     
     # Allowed company domains
     ALLOWED_DOMAINS = ['hhamedicine.com', 'hssmedicine.com']
-    
+
+    # Frozen lookup set and prebuilt rejection message for the hot path
+    _ALLOWED_DOMAIN_SET = frozenset(ALLOWED_DOMAINS)
+    _DOMAIN_ERROR = f"Access restricted to {' and '.join(ALLOWED_DOMAINS)} employees only"
+
     # OTP expiry time (minutes)
     OTP_EXPIRY_MINUTES = 10
     
     # Session expiry time (hours)
     SESSION_EXPIRY_HOURS = 8
-    
+
+    # How often the housekeeping thread purges expired rows (seconds)
+    GC_INTERVAL_SECONDS = 300
+
+    # Minimum gap between last_activity writes per session (seconds)
+    LAST_ACTIVITY_WRITE_INTERVAL = 30
+
     def __init__(self, db_path: str = "enterprise_auth.db"):
         """Initialize the authentication system"""
         self.db_path = db_path
+        self._company_cache = {}
+        self._last_activity_cache = {}
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pooled_conns = []
+        # Dev mode (default, no SMTP configured) dumps OTP emails to a daily
+        # append-only file; set LAUDE_DEV_EMAIL=0 once real SMTP is wired up
+        self._dev_mode = os.environ.get('LAUDE_DEV_EMAIL', '1') == '1'
+        self._emails_dir = Path("otp_emails")
+        self._email_fd = None
+        self._email_date = None
+        if self._dev_mode:
+            self._emails_dir.mkdir(exist_ok=True)
+        atexit.register(self._close_all)
         self.init_database()
-        
+        self._audit_queue = queue.Queue()
+        threading.Thread(target=self._audit_flusher, daemon=True).start()
+        threading.Thread(target=self._housekeeper, daemon=True).start()
+        atexit.register(self._flush_audit_queue)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get the pooled per-thread database connection, creating it lazily"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=256)
+            # WAL lets writers run alongside readers; synchronous=NORMAL drops
+            # the per-commit fsync to per-checkpoint (safe with WAL).
+            # journal_mode persists in the DB file, the rest are per-connection.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._pool_lock:
+                self._pooled_conns.append(conn)
+        return conn
+
+    def _close_all(self):
+        """Close all pooled connections (registered via atexit)"""
+        with self._pool_lock:
+            for conn in self._pooled_conns:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._pooled_conns.clear()
+
     def init_database(self):
         """Initialize the SQLite database with enterprise tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._conn()
             cursor = conn.cursor()
-            
+
             # Users table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS users (
@@ -115,13 +300,54 @@ class EnterpriseAuth:
                 )
             ''')
             
-            conn.commit()
-            
-            # Insert default company settings
+            # Indexes for the auth hot paths (users.email already has an
+            # implicit unique index from the UNIQUE constraint)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_otp_email_used
+                ON otp_codes(email, is_used, created_at DESC)
+            ''')
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_sess_token
+                ON user_sessions(session_token) WHERE is_active = 1
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_audit_user_ts
+                ON audit_log(user_id, timestamp)
+            ''')
+            # Range-scan indexes for the stats queries (recent logins and
+            # active-session counts) instead of full table scans
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_users_last_login
+                ON users(last_login)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sess_active_exp
+                ON user_sessions(is_active, expires_at)
+            ''')
+            cursor.execute('ANALYZE')
+
+            # Insert default company settings; one commit covers the DDL and
+            # the seed rows so setup pays a single fsync
             self._setup_default_companies(cursor)
             conn.commit()
-            
-            conn.close()
+
+            # Preload the (tiny, effectively immutable) company table so
+            # get_company_info is a dict hit at request time
+            cursor.execute('''
+                SELECT domain, company_name, admin_email, smtp_server, smtp_port, smtp_username
+                FROM company_settings WHERE is_active = 1
+            ''')
+            self._company_cache = {
+                row[0]: {
+                    'company_name': row[1],
+                    'admin_email': row[2],
+                    'smtp_server': row[3],
+                    'smtp_port': row[4],
+                    'smtp_username': row[5]
+                }
+                for row in cursor.fetchall()
+            }
+
             logger.info("Enterprise database initialized successfully")
             
         except Exception as e:
@@ -143,393 +369,337 @@ class EnterpriseAuth:
             }
         ]
         
-        for company in companies:
-            cursor.execute('''
-                INSERT OR IGNORE INTO company_settings 
-                (domain, company_name, admin_email)
-                VALUES (?, ?, ?)
-            ''', (company['domain'], company['company_name'], company['admin_email']))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO company_settings
+            (domain, company_name, admin_email)
+            VALUES (?, ?, ?)
+        ''', [(c['domain'], c['company_name'], c['admin_email']) for c in companies])
     
     def validate_email_domain(self, email: str) -> Tuple[bool, str]:
         """Validate if email belongs to allowed company domains"""
         if not email or '@' not in email:
             return False, "Invalid email format"
-        
-        domain = email.split('@')[1].lower()
-        
-        if domain not in self.ALLOWED_DOMAINS:
-            return False, f"Access restricted to {' and '.join(self.ALLOWED_DOMAINS)} employees only"
-        
+
+        match = _EMAIL_RE.match(email)
+        if not match:
+            return False, "Invalid email format"
+
+        domain = match.group(1).lower()
+
+        if domain not in self._ALLOWED_DOMAIN_SET:
+            return False, self._DOMAIN_ERROR
+
         return True, domain
     
+    @_guard('User registration', {'success': False, 'message': "Registration failed. Please try again."})
     def register_user(self, email: str, full_name: str, department: str) -> Dict:
         """Register a new enterprise user"""
-        try:
-            # Validate email domain
-            is_valid, domain_or_error = self.validate_email_domain(email)
-            if not is_valid:
-                return {
-                    'success': False,
-                    'message': domain_or_error
-                }
-            
-            domain = domain_or_error
-            
-            # Get company info
-            company_info = self.get_company_info(domain)
-            if not company_info:
-                return {
-                    'success': False,
-                    'message': f"Company configuration not found for domain: {domain}"
-                }
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if user already exists
-            cursor.execute('SELECT id FROM users WHERE email = ?', (email.lower(),))
-            if cursor.fetchone():
-                conn.close()
-                return {
-                    'success': False,
-                    'message': "User already registered. Please use login instead."
-                }
-            
-            # Insert new user
-            cursor.execute('''
-                INSERT INTO users (email, full_name, department, company_domain)
-                VALUES (?, ?, ?, ?)
-            ''', (email.lower(), full_name.strip(), department.strip(), domain))
-            
-            user_id = cursor.lastrowid
-            
-            # Log the registration
-            self._log_audit(cursor, user_id, "USER_REGISTERED", f"New user registered: {email}")
-            
-            conn.commit()
-            conn.close()
-            
-            logger.info(f"New user registered: {email}")
-            
+        # Normalize once; every lookup below binds the same object
+        email = email.lower()
+
+        # Validate email domain
+        is_valid, domain_or_error = self.validate_email_domain(email)
+        if not is_valid:
             return {
-                'success': True,
-                'message': f"Registration successful! Welcome to {company_info['company_name']}",
-                'user_id': user_id
+                'success': False,
+                'message': domain_or_error
             }
-            
-        except Exception as e:
-            logger.error(f"User registration error: {str(e)}")
+
+        domain = domain_or_error
+
+        # Get company info
+        company_info = self.get_company_info(domain)
+        if not company_info:
             return {
                 'success': False,
-                'message': "Registration failed. Please try again."
+                'message': f"Company configuration not found for domain: {domain}"
             }
-    
+
+        conn = self._conn()
+        cursor = conn.cursor()
+
+        # Check if user already exists
+        cursor.execute('SELECT id FROM users WHERE email = ?', (email,))
+        if cursor.fetchone():
+            return {
+                'success': False,
+                'message': "User already registered. Please use login instead."
+            }
+
+        # Insert new user
+        cursor.execute('''
+            INSERT INTO users (email, full_name, department, company_domain)
+            VALUES (?, ?, ?, ?)
+        ''', (email, full_name.strip(), department.strip(), domain))
+
+        user_id = cursor.lastrowid
+
+        # Log the registration
+        self._log_audit(user_id, "USER_REGISTERED", f"New user registered: {email}")
+
+        conn.commit()
+        logger.info(f"New user registered: {email}")
+
+        return {
+            'success': True,
+            'message': f"Registration successful! Welcome to {company_info['company_name']}",
+            'user_id': user_id
+        }
+
+
+    @_guard('OTP generation', {'success': False, 'message': "Failed to generate OTP. Please try again."})
     def generate_otp(self, email: str) -> Dict:
         """Generate OTP for email verification"""
-        try:
-            # Validate email domain first
-            is_valid, domain_or_error = self.validate_email_domain(email)
-            if not is_valid:
-                return {
-                    'success': False,
-                    'message': domain_or_error
-                }
-            
-            # Generate 6-digit OTP
-            otp_code = f"{secrets.randbelow(900000) + 100000:06d}"
-            
-            # Calculate expiry time
-            expires_at = datetime.now() + timedelta(minutes=self.OTP_EXPIRY_MINUTES)
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Deactivate any existing OTPs for this email
-            cursor.execute('''
-                UPDATE otp_codes SET is_used = 1 
-                WHERE email = ? AND is_used = 0
-            ''', (email.lower(),))
-            
-            # Insert new OTP
-            cursor.execute('''
-                INSERT INTO otp_codes (email, otp_code, expires_at)
-                VALUES (?, ?, ?)
-            ''', (email.lower(), otp_code, expires_at))
-            
-            conn.commit()
-            conn.close()
-            
-            # Send OTP via email
-            email_sent = self.send_otp_email(email, otp_code, expires_at)
-            
-            if email_sent:
-                logger.info(f"OTP generated and sent to: {email}")
-                return {
-                    'success': True,
-                    'message': f"OTP sent to {email}. Valid for {self.OTP_EXPIRY_MINUTES} minutes.",
-                    'expires_in_minutes': self.OTP_EXPIRY_MINUTES
-                }
-            else:
-                return {
-                    'success': False,
-                    'message': "Failed to send OTP email. Please try again."
-                }
-                
-        except Exception as e:
-            logger.error(f"OTP generation error: {str(e)}")
+        # Normalize once; every statement below binds the same object
+        email = email.lower()
+
+        # Validate email domain first
+        is_valid, domain_or_error = self.validate_email_domain(email)
+        if not is_valid:
             return {
                 'success': False,
-                'message': "Failed to generate OTP. Please try again."
+                'message': domain_or_error
             }
-    
+
+        # Generate 6-digit OTP from one urandom read; the modulo bias over
+        # 2^24 is < 1 part per million, negligible for a short-lived code
+        otp_code = str(int.from_bytes(os.urandom(3), 'big') % 1000000).zfill(6)
+
+        # Calculate expiry time
+        expires_at = datetime.now() + timedelta(minutes=self.OTP_EXPIRY_MINUTES)
+
+        conn = self._conn()
+        cursor = conn.cursor()
+
+        # Deactivate any existing OTPs for this email
+        cursor.execute('''
+            UPDATE otp_codes SET is_used = 1 
+            WHERE email = ? AND is_used = 0
+        ''', (email,))
+
+        # Insert new OTP
+        cursor.execute('''
+            INSERT INTO otp_codes (email, otp_code, expires_at)
+            VALUES (?, ?, ?)
+        ''', (email, otp_code, expires_at))
+
+        conn.commit()
+        # Send OTP via email
+        email_sent = self.send_otp_email(email, otp_code, expires_at)
+
+        if email_sent:
+            logger.info(f"OTP generated and sent to: {email}")
+            return {
+                'success': True,
+                'message': f"OTP sent to {email}. Valid for {self.OTP_EXPIRY_MINUTES} minutes.",
+                'expires_in_minutes': self.OTP_EXPIRY_MINUTES
+            }
+        else:
+            return {
+                'success': False,
+                'message': "Failed to send OTP email. Please try again."
+            }
+
+
+    @_guard('OTP verification', {'success': False, 'message': "Login failed. Please try again."})
     def verify_otp(self, email: str, otp_code: str) -> Dict:
         """Verify OTP and create user session"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Find valid OTP
-            cursor.execute('''
-                SELECT id, expires_at, attempts FROM otp_codes
-                WHERE email = ? AND otp_code = ? AND is_used = 0
-                ORDER BY created_at DESC LIMIT 1
-            ''', (email.lower(), otp_code))
-            
+        # Normalize once; every statement below binds the same object
+        email = email.lower()
+
+        conn = self._conn()
+        cursor = conn.cursor()
+
+        # Claim and consume the newest matching OTP in a single statement
+        cursor.execute(_SQL_CLAIM_OTP, (email, otp_code))
+        claimed = cursor.fetchone()
+
+        if not claimed:
+            # Work out which failure message applies
+            cursor.execute(_SQL_FIND_OTP, (email, otp_code))
             otp_record = cursor.fetchone()
-            
-            if not otp_record:
-                # Increment attempt count for failed attempts
-                cursor.execute('''
-                    UPDATE otp_codes SET attempts = attempts + 1
-                    WHERE email = ? AND is_used = 0
-                ''', (email.lower(),))
-                conn.commit()
-                conn.close()
-                
-                return {
-                    'success': False,
-                    'message': "Invalid OTP code. Please check and try again."
-                }
-            
-            otp_id, expires_at_str, attempts = otp_record
-            expires_at = datetime.fromisoformat(expires_at_str)
-            
-            # Check if OTP has expired
-            if datetime.now() > expires_at:
-                cursor.execute('UPDATE otp_codes SET is_used = 1 WHERE id = ?', (otp_id,))
+
+            if otp_record:
+                # Code matched but was expired or over the attempt limit
+                otp_id, expires_at_str, attempts = otp_record
+                cursor.execute(_SQL_MARK_OTP_USED, (otp_id,))
                 conn.commit()
-                conn.close()
-                
+                if attempts >= 3:
+                    return {
+                        'success': False,
+                        'message': "Too many failed attempts. Please request a new OTP."
+                    }
                 return {
                     'success': False,
                     'message': "OTP has expired. Please request a new one."
                 }
-            
-            # Check attempt limits
-            if attempts >= 3:
-                cursor.execute('UPDATE otp_codes SET is_used = 1 WHERE id = ?', (otp_id,))
-                conn.commit()
-                conn.close()
-                
-                return {
-                    'success': False,
-                    'message': "Too many failed attempts. Please request a new OTP."
-                }
-            
-            # Mark OTP as used
-            cursor.execute('UPDATE otp_codes SET is_used = 1 WHERE id = ?', (otp_id,))
-            
-            # Get or create user
-            cursor.execute('SELECT id, full_name, department, company_domain FROM users WHERE email = ?', (email.lower(),))
-            user_record = cursor.fetchone()
-            
-            if not user_record:
-                conn.close()
-                return {
-                    'success': False,
-                    'message': "User not found. Please register first."
-                }
-            
-            user_id, full_name, department, company_domain = user_record
-            
-            # Create session token
-            session_token = secrets.token_urlsafe(32)
-            session_expires = datetime.now() + timedelta(hours=self.SESSION_EXPIRY_HOURS)
-            
-            # Insert new session
-            cursor.execute('''
-                INSERT INTO user_sessions (user_id, session_token, expires_at)
-                VALUES (?, ?, ?)
-            ''', (user_id, session_token, session_expires))
-            
-            # Update user login stats
+
+            # Increment attempt count for failed attempts
             cursor.execute('''
-                UPDATE users SET last_login = CURRENT_TIMESTAMP, login_count = login_count + 1
-                WHERE id = ?
-            ''', (user_id,))
-            
-            # Log successful login
-            self._log_audit(cursor, user_id, "LOGIN_SUCCESS", f"Successful OTP login from {email}")
-            
+                UPDATE otp_codes SET attempts = attempts + 1
+                WHERE email = ? AND is_used = 0
+            ''', (email,))
             conn.commit()
-            conn.close()
-            
-            logger.info(f"Successful login: {email}")
-            
             return {
-                'success': True,
-                'message': "Login successful!",
-                'session_token': session_token,
-                'user_data': {
-                    'user_id': user_id,
-                    'email': email,
-                    'full_name': full_name,
-                    'department': department,
-                    'company_domain': company_domain,
-                    'session_expires': session_expires.isoformat()
-                }
+                'success': False,
+                'message': "Invalid OTP code. Please check and try again."
             }
-            
-        except Exception as e:
-            logger.error(f"OTP verification error: {str(e)}")
+
+        # Update login stats and fetch the user in one round-trip
+        cursor.execute(_SQL_TOUCH_USER, (email,))
+        user_record = cursor.fetchone()
+
+        if not user_record:
+            conn.commit()
             return {
                 'success': False,
-                'message': "Login failed. Please try again."
+                'message': "User not found. Please register first."
             }
-    
+
+        user_id, full_name, department, company_domain = user_record
+
+        # Create session token
+        session_token = secrets.token_urlsafe(32)
+        session_expires = datetime.now() + timedelta(hours=self.SESSION_EXPIRY_HOURS)
+
+        # Insert new session
+        cursor.execute(_SQL_INSERT_SESSION, (user_id, session_token, session_expires))
+
+        # Log successful login
+        self._log_audit(user_id, "LOGIN_SUCCESS", f"Successful OTP login from {email}")
+
+        conn.commit()
+        logger.info(f"Successful login: {email}")
+
+        return {
+            'success': True,
+            'message': "Login successful!",
+            'session_token': session_token,
+            'user_data': {
+                'user_id': user_id,
+                'email': email,
+                'full_name': full_name,
+                'department': department,
+                'company_domain': company_domain,
+                'session_expires': session_expires.isoformat()
+            }
+        }
+
+
+    @_guard('Session validation', {'success': False, 'message': "Session validation failed. Please login again."})
     def validate_session(self, session_token: str) -> Dict:
         """Validate user session token"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT s.user_id, s.expires_at, u.email, u.full_name, u.department, u.company_domain
-                FROM user_sessions s
-                JOIN users u ON s.user_id = u.id
-                WHERE s.session_token = ? AND s.is_active = 1
-            ''', (session_token,))
-            
-            session_record = cursor.fetchone()
-            
-            if not session_record:
-                conn.close()
-                return {
-                    'success': False,
-                    'message': "Invalid session. Please login again."
-                }
-            
-            user_id, expires_at_str, email, full_name, department, company_domain = session_record
-            expires_at = datetime.fromisoformat(expires_at_str)
-            
-            # Check if session has expired
-            if datetime.now() > expires_at:
-                cursor.execute('UPDATE user_sessions SET is_active = 0 WHERE session_token = ?', (session_token,))
+        conn = self._conn()
+        cursor = conn.cursor()
+
+        cursor.execute(_SQL_VALIDATE_SESSION, (session_token,))
+
+        session_record = cursor.fetchone()
+
+        if not session_record:
+            # Token exists but failed the SQL-side expiry check
+            cursor.execute(_SQL_SESSION_EXISTS, (session_token,))
+            if cursor.fetchone():
+                cursor.execute(_SQL_DEACTIVATE_SESSION, (session_token,))
                 conn.commit()
-                conn.close()
-                
                 return {
                     'success': False,
                     'message': "Session expired. Please login again."
                 }
-            
-            # Update last activity
-            cursor.execute('''
-                UPDATE user_sessions SET last_activity = CURRENT_TIMESTAMP
-                WHERE session_token = ?
-            ''', (session_token,))
-            
-            conn.commit()
-            conn.close()
-            
-            return {
-                'success': True,
-                'user_data': {
-                    'user_id': user_id,
-                    'email': email,
-                    'full_name': full_name,
-                    'department': department,
-                    'company_domain': company_domain,
-                    'session_expires': expires_at.isoformat()
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Session validation error: {str(e)}")
             return {
                 'success': False,
-                'message': "Session validation failed. Please login again."
+                'message': "Invalid session. Please login again."
             }
-    
-    def logout_user(self, session_token: str) -> Dict:
-        """Logout user by invalidating session"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get user info before logout
-            cursor.execute('''
-                SELECT s.user_id, u.email FROM user_sessions s
-                JOIN users u ON s.user_id = u.id
-                WHERE s.session_token = ? AND s.is_active = 1
-            ''', (session_token,))
-            
-            user_record = cursor.fetchone()
-            
-            # Deactivate session
-            cursor.execute('''
-                UPDATE user_sessions SET is_active = 0
-                WHERE session_token = ?
-            ''', (session_token,))
-            
-            if user_record:
-                user_id, email = user_record
-                self._log_audit(cursor, user_id, "LOGOUT", f"User logged out: {email}")
-                logger.info(f"User logged out: {email}")
-            
+
+        user_id, expires_at_str, email, full_name, department, company_domain = session_record
+
+        # Throttle the last_activity write so most validations stay
+        # read-only; ~30s precision is fine for session liveness
+        now = time.time()
+        if now - self._last_activity_cache.get(session_token, 0) >= self.LAST_ACTIVITY_WRITE_INTERVAL:
+            cursor.execute(_SQL_UPDATE_LAST_ACTIVITY, (session_token,))
             conn.commit()
-            conn.close()
-            
-            return {
-                'success': True,
-                'message': "Logged out successfully"
-            }
-            
-        except Exception as e:
-            logger.error(f"Logout error: {str(e)}")
-            return {
-                'success': False,
-                'message': "Logout failed"
+            if len(self._last_activity_cache) > 10000:
+                self._last_activity_cache.clear()
+            self._last_activity_cache[session_token] = now
+
+        return {
+            'success': True,
+            'user_data': {
+                'user_id': user_id,
+                'email': email,
+                'full_name': full_name,
+                'department': department,
+                'company_domain': company_domain,
+                'session_expires': expires_at_str
             }
-    
+        }
+
+
+    @_guard('Logout', {'success': False, 'message': "Logout failed"})
+    def logout_user(self, session_token: str) -> Dict:
+        """Logout user by invalidating session"""
+        conn = self._conn()
+        cursor = conn.cursor()
+
+        # Get user info before logout
+        cursor.execute('''
+            SELECT s.user_id, u.email FROM user_sessions s
+            JOIN users u ON s.user_id = u.id
+            WHERE s.session_token = ? AND s.is_active = 1
+        ''', (session_token,))
+
+        user_record = cursor.fetchone()
+
+        # Deactivate session
+        cursor.execute(_SQL_DEACTIVATE_SESSION, (session_token,))
+
+        if user_record:
+            user_id, email = user_record
+            self._log_audit(user_id, "LOGOUT", f"User logged out: {email}")
+            logger.info(f"User logged out: {email}")
+
+        conn.commit()
+        return {
+            'success': True,
+            'message': "Logged out successfully"
+        }
+
+
     def get_company_info(self, domain: str) -> Optional[Dict]:
-        """Get company information by domain"""
+        """Get company information by domain (cached; company_settings is
+        effectively immutable at runtime)"""
+        info = self._company_cache.get(domain)
+        if info is not None:
+            return info
+
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._conn()
             cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT company_name, admin_email, smtp_server, smtp_port, smtp_username
-                FROM company_settings WHERE domain = ? AND is_active = 1
-            ''', (domain,))
-            
+
+            cursor.execute(_SQL_COMPANY_INFO, (domain,))
+
             company_record = cursor.fetchone()
-            conn.close()
-            
             if company_record:
-                return {
+                info = {
                     'company_name': company_record[0],
                     'admin_email': company_record[1],
                     'smtp_server': company_record[2],
                     'smtp_port': company_record[3],
                     'smtp_username': company_record[4]
                 }
-            
+                self._company_cache[domain] = info
+                return info
+
             return None
-            
+
         except Exception as e:
             logger.error(f"Company info retrieval error: {str(e)}")
             return None
+
+    def clear_company_cache(self):
+        """Invalidate the company cache after admin edits to company_settings"""
+        self._company_cache.clear()
     
     def send_otp_email(self, email: str, otp_code: str, expires_at: datetime) -> bool:
         """Send OTP via email (placeholder - requires SMTP configuration)"""
@@ -544,42 +714,18 @@ class EnterpriseAuth:
             # Create email content
             subject = f"Laude Agent - Login Verification Code"
             
-            html_body = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #1f4e79;">🎙️ Laude Agent - Login Verification</h2>
-                
-                <p>Hello,</p>
-                
-                <p>Your verification code for Laude Agent is:</p>
-                
-                <div style="background-color: #f0f8ff; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px;">
-                    <h1 style="color: #1f4e79; font-size: 32px; margin: 0; letter-spacing: 5px;">{otp_code}</h1>
-                </div>
-                
-                <p><strong>Important Details:</strong></p>
-                <ul>
-                    <li>This code expires at: {expires_at.strftime('%I:%M %p on %B %d, %Y')}</li>
-                    <li>Valid for {self.OTP_EXPIRY_MINUTES} minutes only</li>
-                    <li>Do not share this code with anyone</li>
-                </ul>
-                
-                <p>If you didn't request this code, please ignore this email.</p>
-                
-                <hr style="margin: 30px 0;">
-                <p style="color: #666; font-size: 12px;">
-                    Laude Agent Enterprise System<br>
-                    {company_info['company_name']}<br>
-                    This is an automated message - please do not reply.
-                </p>
-            </body>
-            </html>
-            """
-            
-            # For development, save to file instead of sending
-            # In production, implement actual SMTP sending
-            self._save_email_to_file(email, subject, html_body, otp_code)
-            
+            html_body = _OTP_HTML_TMPL.substitute(
+                otp=otp_code,
+                expires=expires_at.strftime('%I:%M %p on %B %d, %Y'),
+                minutes=self.OTP_EXPIRY_MINUTES,
+                company=company_info['company_name']
+            )
+            
+            if self._dev_mode:
+                # For development, save to file instead of sending
+                self._save_email_to_file(email, subject, html_body, otp_code)
+            # In production, implement actual SMTP sending here
+
             logger.info(f"OTP email prepared for: {email}")
             return True
             
@@ -588,85 +734,119 @@ class EnterpriseAuth:
             return False
     
     def _save_email_to_file(self, email: str, subject: str, body: str, otp_code: str):
-        """Save email to file for development purposes"""
+        """Append email to the daily development dump file"""
         try:
-            emails_dir = Path("otp_emails")
-            emails_dir.mkdir(exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = emails_dir / f"otp_{email.replace('@', '_at_')}_{timestamp}.html"
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"<!-- OTP: {otp_code} -->\n")
-                f.write(f"<!-- To: {email} -->\n")
-                f.write(f"<!-- Subject: {subject} -->\n")
-                f.write("<!-- " + "="*50 + " -->\n\n")
-                f.write(body)
-            
-            # Also save simple text version for easy viewing
-            text_file = emails_dir / f"otp_{email.replace('@', '_at_')}_{timestamp}.txt"
-            with open(text_file, 'w', encoding='utf-8') as f:
-                f.write(f"OTP CODE: {otp_code}\n")
-                f.write(f"TO: {email}\n")
-                f.write(f"EXPIRES: {datetime.now() + timedelta(minutes=self.OTP_EXPIRY_MINUTES)}\n")
-                f.write("="*40 + "\n")
-                f.write("FOR DEVELOPMENT: Email saved to file instead of sending\n")
-            
-            logger.info(f"Development: OTP email saved to {filename}")
-            
+            today = date.today()
+            if self._email_fd is None or self._email_date != today:
+                # One O_APPEND fd per day instead of two fresh files per OTP
+                if self._email_fd is not None:
+                    os.close(self._email_fd)
+                self._email_date = today
+                daily_file = self._emails_dir / f"otp_{today.isoformat()}.ndjson"
+                self._email_fd = os.open(str(daily_file),
+                                         os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+
+            record = json.dumps({
+                'timestamp': datetime.now().isoformat(),
+                'to': email,
+                'subject': subject,
+                'otp_code': otp_code,
+                'expires_in_minutes': self.OTP_EXPIRY_MINUTES,
+                'body': body
+            })
+            os.write(self._email_fd, record.encode('utf-8') + b'\n')
+
+            logger.info(f"Development: OTP email appended to otp_{today.isoformat()}.ndjson")
+
         except Exception as e:
             logger.error(f"Error saving email to file: {str(e)}")
     
-    def _log_audit(self, cursor, user_id: int, action: str, details: str, ip_address: str = None):
-        """Log audit trail"""
-        cursor.execute('''
-            INSERT INTO audit_log (user_id, action, details, ip_address)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, action, details, ip_address))
+    def _log_audit(self, user_id: int, action: str, details: str, ip_address: str = None):
+        """Queue an audit trail entry for the background flusher"""
+        self._audit_queue.put_nowait((user_id, action, details, ip_address))
+
+    def _audit_flusher(self):
+        """Daemon thread: coalesce queued audit rows into batched inserts"""
+        while True:
+            rows = [self._audit_queue.get()]
+            try:
+                while len(rows) < 256:
+                    rows.append(self._audit_queue.get(timeout=1.0))
+            except queue.Empty:
+                pass
+            self._write_audit_rows(rows)
+
+    def _flush_audit_queue(self):
+        """Flush any still-queued audit rows (registered via atexit)"""
+        rows = []
+        try:
+            while True:
+                rows.append(self._audit_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if rows:
+            self._write_audit_rows(rows)
+
+    def _housekeeper(self):
+        """Daemon thread: purge long-expired OTPs and sessions so the hot
+        indexes stay small, then checkpoint the WAL"""
+        while True:
+            time.sleep(self.GC_INTERVAL_SECONDS)
+            try:
+                conn = self._conn()
+                conn.execute('''
+                    DELETE FROM otp_codes
+                    WHERE expires_at < datetime('now', 'localtime', '-1 day')
+                ''')
+                conn.execute('''
+                    DELETE FROM user_sessions
+                    WHERE expires_at < datetime('now', 'localtime', '-7 day')
+                ''')
+                conn.commit()
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            except Exception as e:
+                logger.error(f"Housekeeping error: {str(e)}")
+
+    def _write_audit_rows(self, rows):
+        """Write a batch of audit rows in a single transaction"""
+        try:
+            conn = self._conn()
+            conn.executemany(_SQL_INSERT_AUDIT, rows)
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Audit log flush error: {str(e)}")
     
+    @_guard('Stats retrieval', {})
     def get_user_stats(self) -> Dict:
         """Get system usage statistics"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Total users
-            cursor.execute('SELECT COUNT(*) FROM users WHERE is_active = 1')
-            total_users = cursor.fetchone()[0]
-            
-            # Users by domain
-            cursor.execute('''
-                SELECT company_domain, COUNT(*) FROM users 
-                WHERE is_active = 1 GROUP BY company_domain
-            ''')
-            users_by_domain = dict(cursor.fetchall())
-            
-            # Active sessions
-            cursor.execute('''
-                SELECT COUNT(*) FROM user_sessions 
-                WHERE is_active = 1 AND expires_at > datetime('now')
-            ''')
-            active_sessions = cursor.fetchone()[0]
-            
-            # Recent logins (last 24 hours)
-            cursor.execute('''
-                SELECT COUNT(*) FROM users 
-                WHERE last_login > datetime('now', '-1 day')
-            ''')
-            recent_logins = cursor.fetchone()[0]
-            
-            conn.close()
-            
-            return {
-                'total_users': total_users,
-                'users_by_domain': users_by_domain,
-                'active_sessions': active_sessions,
-                'recent_logins_24h': recent_logins
-            }
-            
-        except Exception as e:
-            logger.error(f"Stats retrieval error: {str(e)}")
-            return {}
+        conn = self._conn()
+        cursor = conn.cursor()
+
+        # Total users, active sessions, and recent logins in one round-trip
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM users WHERE is_active = 1),
+                (SELECT COUNT(*) FROM user_sessions
+                 WHERE is_active = 1 AND expires_at > datetime('now')),
+                (SELECT COUNT(*) FROM users
+                 WHERE last_login > datetime('now', '-1 day'))
+        ''')
+        total_users, active_sessions, recent_logins = cursor.fetchone()
+
+        # Users by domain
+        cursor.execute('''
+            SELECT company_domain, COUNT(*) FROM users
+            WHERE is_active = 1 GROUP BY company_domain
+        ''')
+        users_by_domain = dict(cursor.fetchall())
+
+        return {
+            'total_users': total_users,
+            'users_by_domain': users_by_domain,
+            'active_sessions': active_sessions,
+            'recent_logins_24h': recent_logins
+        }
+
 
 
 # Example usage and testing
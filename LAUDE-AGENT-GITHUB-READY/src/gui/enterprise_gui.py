@@ -6,25 +6,51 @@ Professional login system with OTP verification
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import threading
+from tkinter import font as tkfont
+from concurrent.futures import ThreadPoolExecutor
+import time
 import os
 import sys
 import json
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 import webbrowser
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from auth_system import EnterpriseAuth
-from generate_professional_email import generate_professional_email
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Mirrors EnterpriseAuth.ALLOWED_DOMAINS so obviously bad input is rejected
+# on the UI thread before a worker and an OTP round-trip are spent on it
+_ALLOWED_DOMAINS = ('@hhamedicine.com', '@hssmedicine.com')
+
+@lru_cache(maxsize=32)
+def _ensure_dir(path):
+    """Create a directory if needed; repeat calls in-process are cache hits"""
+    p = Path(path)
+    if not p.is_dir():
+        p.mkdir(parents=True, exist_ok=True)
+
+@lru_cache(maxsize=4)
+def _sample_transcript(company_short):
+    """Demo transcript for quick-email generation, built once per company"""
+    return f"""
+        This week at {company_short} I completed several important tasks.
+        I worked on system improvements and collaborated with the team on various projects.
+        Performance was good this week and I maintained all operational standards.
+        Next week I'm planning to focus on new initiatives and continued development.
+        """
+
+def _import_email_generator():
+    """Import the email generator on demand; it pulls in the OpenAI SDK"""
+    from generate_professional_email import generate_professional_email
+    return generate_professional_email
+
 class EnterpriseLoginGUI:
     """Enterprise-grade login interface for Laude Agent"""
     
@@ -35,48 +61,121 @@ class EnterpriseLoginGUI:
         self.root.configure(bg='#f8f9fa')
         self.root.resizable(False, False)
         
-        # Initialize authentication system
+        # Initialize authentication system; imported here instead of at
+        # module level so the login window paints before the crypto/DB
+        # machinery loads
+        from auth_system import EnterpriseAuth
         self.auth = EnterpriseAuth()
+
+        # One small worker pool for auth and generation calls: no per-click
+        # thread creation, and concurrency stays bounded if a button is mashed
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='laude-auth')
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Warm the email-generator import off the UI thread so the first
+        # "Generate Quick Email" click finds it already in sys.modules
+        self._pool.submit(_import_email_generator)
         
         # Session management
         self.session_token = None
         self.user_data = None
         self.session_check_job = None
+        self._session_expires_dt = None  # parsed once per login
+        self._company_domain_upper = None  # derived once per login
+        self._company_short = None
+        self._company_name = None
         
         # UI state
         self.current_step = "email"  # email -> otp -> main_app
+        self._timer_job = None
+        self._otp_deadline = None
         
         self.setup_styles()
+
+        # Build the shell (header + content area) and every login-flow step
+        # frame once; step changes raise a pre-built frame instead of
+        # destroying and recreating the whole widget tree
+        main_frame = tk.Frame(self.root, bg='#ffffff', relief='solid', bd=1)
+        main_frame.pack(fill='both', expand=True, padx=40, pady=40)
+
+        header_frame = tk.Frame(main_frame, bg='#1f4e79', height=100)
+        header_frame.pack(fill='x', padx=0, pady=0)
+        header_frame.pack_propagate(False)
+
+        title_label = tk.Label(header_frame, text="🎙️ Laude Agent",
+                              font=self._fonts['title'],
+                              fg='white', bg='#1f4e79')
+        title_label.pack(pady=20)
+
+        subtitle_label = tk.Label(header_frame, text="Enterprise Voice-to-Email Platform",
+                                 font=self._fonts['body12'],
+                                 fg='#e8f4fd', bg='#1f4e79')
+        subtitle_label.pack()
+
+        self._content = tk.Frame(main_frame, bg='#ffffff')
+        self._content.pack(fill='both', expand=True, padx=40, pady=40)
+        self._content.grid_rowconfigure(0, weight=1)
+        self._content.grid_columnconfigure(0, weight=1)
+
+        self.frames = {}
+        self._step_entries = {}
+        for step, builder in (("email", self.create_email_step),
+                              ("register", self.create_registration_step),
+                              ("otp", self.create_otp_step)):
+            frame = tk.Frame(self._content, bg='#ffffff')
+            frame.grid(row=0, column=0, sticky='nsew')
+            builder(frame)
+            self.frames[step] = frame
+
+        # The main app depends on the logged-in user, so it is built per login
+        self.frames["main_app"] = None
+
         self.create_login_interface()
         self.center_window()
         
     def setup_styles(self):
         """Setup professional styling"""
+        # One shared named font per role: Tk reuses each font object's
+        # measurement cache instead of re-resolving a tuple for every widget
+        self._fonts = {
+            'title': tkfont.Font(family='Segoe UI', size=24, weight='bold'),
+            'h2': tkfont.Font(family='Segoe UI', size=18, weight='bold'),
+            'otp': tkfont.Font(family='Segoe UI', size=16, weight='bold'),
+            'feature': tkfont.Font(family='Segoe UI', size=14, weight='bold'),
+            'h3': tkfont.Font(family='Segoe UI', size=12, weight='bold'),
+            'body12': tkfont.Font(family='Segoe UI', size=12),
+            'h4': tkfont.Font(family='Segoe UI', size=11, weight='bold'),
+            'body': tkfont.Font(family='Segoe UI', size=11),
+            'small': tkfont.Font(family='Segoe UI', size=10),
+            'tiny': tkfont.Font(family='Segoe UI', size=9),
+            'mono': tkfont.Font(family='Consolas', size=11),
+        }
+
         style = ttk.Style()
         style.theme_use('clam')
         
         # Configure custom styles
         style.configure('Title.TLabel', 
-                       font=('Segoe UI', 18, 'bold'),
+                       font=self._fonts['h2'],
                        foreground='#1f4e79',
                        background='#f8f9fa')
         
         style.configure('Subtitle.TLabel',
-                       font=('Segoe UI', 11),
+                       font=self._fonts['body'],
                        foreground='#6c757d',
                        background='#f8f9fa')
         
         style.configure('Enterprise.TButton',
-                       font=('Segoe UI', 11, 'bold'),
+                       font=self._fonts['h4'],
                        padding=(20, 10))
         
         style.configure('Success.TLabel',
-                       font=('Segoe UI', 10),
+                       font=self._fonts['small'],
                        foreground='#28a745',
                        background='#f8f9fa')
         
         style.configure('Error.TLabel',
-                       font=('Segoe UI', 10),
+                       font=self._fonts['small'],
                        foreground='#dc3545',
                        background='#f8f9fa')
     
@@ -88,43 +187,21 @@ class EnterpriseLoginGUI:
         self.root.geometry(f"+{x}+{y}")
     
     def create_login_interface(self):
-        """Create the main login interface"""
-        # Clear existing widgets
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        # Main container
-        main_frame = tk.Frame(self.root, bg='#ffffff', relief='solid', bd=1)
-        main_frame.pack(fill='both', expand=True, padx=40, pady=40)
-        
-        # Header section
-        header_frame = tk.Frame(main_frame, bg='#1f4e79', height=100)
-        header_frame.pack(fill='x', padx=0, pady=0)
-        header_frame.pack_propagate(False)
-        
-        # Logo and title
-        title_label = tk.Label(header_frame, text="🎙️ Laude Agent", 
-                              font=('Segoe UI', 24, 'bold'), 
-                              fg='white', bg='#1f4e79')
-        title_label.pack(pady=20)
-        
-        subtitle_label = tk.Label(header_frame, text="Enterprise Voice-to-Email Platform", 
-                                 font=('Segoe UI', 12), 
-                                 fg='#e8f4fd', bg='#1f4e79')
-        subtitle_label.pack()
-        
-        # Content area
-        content_frame = tk.Frame(main_frame, bg='#ffffff')
-        content_frame.pack(fill='both', expand=True, padx=40, pady=40)
-        
-        if self.current_step == "email":
-            self.create_email_step(content_frame)
-        elif self.current_step == "register":
-            self.create_registration_step(content_frame)
-        elif self.current_step == "otp":
-            self.create_otp_step(content_frame)
-        elif self.current_step == "main_app":
-            self.create_main_app(content_frame)
+        """Show the interface for the current step by raising its frame"""
+        if self.current_step == "main_app":
+            # User data changes per login, so only this frame is rebuilt
+            if self.frames["main_app"] is not None:
+                self.frames["main_app"].destroy()
+            frame = tk.Frame(self._content, bg='#ffffff')
+            frame.grid(row=0, column=0, sticky='nsew')
+            self.create_main_app(frame)
+            self.frames["main_app"] = frame
+
+        self.frames[self.current_step].tkraise()
+
+        entry = self._step_entries.get(self.current_step)
+        if entry is not None:
+            entry.focus()
     
     def create_email_step(self, parent):
         """Create email input step"""
@@ -143,42 +220,42 @@ class EnterpriseLoginGUI:
         email_frame.pack(pady=20)
         
         tk.Label(email_frame, text="Corporate Email Address", 
-                font=('Segoe UI', 12, 'bold'), fg='#495057', bg='#ffffff').pack(anchor='w')
+                font=self._fonts['h3'], fg='#495057', bg='#ffffff').pack(anchor='w')
         
         self.email_var = tk.StringVar()
         email_entry = tk.Entry(email_frame, textvariable=self.email_var, 
-                              font=('Segoe UI', 12), width=35, relief='solid', bd=1)
+                              font=self._fonts['body12'], width=35, relief='solid', bd=1)
         email_entry.pack(pady=(5, 10), ipady=8)
-        email_entry.focus()
+        self._step_entries["email"] = email_entry
         
         # Domain restriction info
         info_frame = tk.Frame(parent, bg='#e7f3ff', relief='solid', bd=1)
         info_frame.pack(fill='x', pady=20)
         
         tk.Label(info_frame, text="ℹ️  Access Restricted", 
-                font=('Segoe UI', 11, 'bold'), fg='#1f4e79', bg='#e7f3ff').pack(anchor='w', padx=15, pady=(10, 5))
+                font=self._fonts['h4'], fg='#1f4e79', bg='#e7f3ff').pack(anchor='w', padx=15, pady=(10, 5))
         
         tk.Label(info_frame, text="• Only @hhamedicine.com and @hssmedicine.com emails allowed", 
-                font=('Segoe UI', 10), fg='#495057', bg='#e7f3ff').pack(anchor='w', padx=15)
+                font=self._fonts['small'], fg='#495057', bg='#e7f3ff').pack(anchor='w', padx=15)
         
         tk.Label(info_frame, text="• OTP verification required for secure access", 
-                font=('Segoe UI', 10), fg='#495057', bg='#e7f3ff').pack(anchor='w', padx=15, pady=(0, 10))
+                font=self._fonts['small'], fg='#495057', bg='#e7f3ff').pack(anchor='w', padx=15, pady=(0, 10))
         
         # Buttons
         button_frame = tk.Frame(parent, bg='#ffffff')
         button_frame.pack(pady=30)
         
         # Continue button
-        continue_btn = tk.Button(button_frame, text="Continue with Email", 
-                               font=('Segoe UI', 12, 'bold'),
+        self._continue_btn = tk.Button(button_frame, text="Continue with Email", 
+                               font=self._fonts['h3'],
                                bg='#1f4e79', fg='white', 
                                command=self.process_email_step,
                                width=20, height=2, relief='flat')
-        continue_btn.pack(side='left', padx=10)
+        self._continue_btn.pack(side='left', padx=10)
         
         # New user button
         register_btn = tk.Button(button_frame, text="New User? Register", 
-                               font=('Segoe UI', 11),
+                               font=self._fonts['body'],
                                bg='#6c757d', fg='white',
                                command=self.show_registration_step,
                                width=18, height=2, relief='flat')
@@ -203,44 +280,44 @@ class EnterpriseLoginGUI:
         
         # Email field
         tk.Label(form_frame, text="Corporate Email *", 
-                font=('Segoe UI', 11, 'bold'), fg='#495057', bg='#ffffff').grid(row=0, column=0, sticky='w', pady=(0, 5))
+                font=self._fonts['h4'], fg='#495057', bg='#ffffff').grid(row=0, column=0, sticky='w', pady=(0, 5))
         
         self.reg_email_var = tk.StringVar()
         email_entry = tk.Entry(form_frame, textvariable=self.reg_email_var, 
-                              font=('Segoe UI', 11), width=35, relief='solid', bd=1)
+                              font=self._fonts['body'], width=35, relief='solid', bd=1)
         email_entry.grid(row=1, column=0, pady=(0, 15), ipady=6)
         
         # Full name field
         tk.Label(form_frame, text="Full Name *", 
-                font=('Segoe UI', 11, 'bold'), fg='#495057', bg='#ffffff').grid(row=2, column=0, sticky='w', pady=(0, 5))
+                font=self._fonts['h4'], fg='#495057', bg='#ffffff').grid(row=2, column=0, sticky='w', pady=(0, 5))
         
         self.reg_name_var = tk.StringVar()
         name_entry = tk.Entry(form_frame, textvariable=self.reg_name_var, 
-                             font=('Segoe UI', 11), width=35, relief='solid', bd=1)
+                             font=self._fonts['body'], width=35, relief='solid', bd=1)
         name_entry.grid(row=3, column=0, pady=(0, 15), ipady=6)
         
         # Department field
         tk.Label(form_frame, text="Department/Role *", 
-                font=('Segoe UI', 11, 'bold'), fg='#495057', bg='#ffffff').grid(row=4, column=0, sticky='w', pady=(0, 5))
+                font=self._fonts['h4'], fg='#495057', bg='#ffffff').grid(row=4, column=0, sticky='w', pady=(0, 5))
         
         self.reg_dept_var = tk.StringVar()
         dept_entry = tk.Entry(form_frame, textvariable=self.reg_dept_var, 
-                             font=('Segoe UI', 11), width=35, relief='solid', bd=1)
+                             font=self._fonts['body'], width=35, relief='solid', bd=1)
         dept_entry.grid(row=5, column=0, pady=(0, 20), ipady=6)
         
         # Buttons
         button_frame = tk.Frame(parent, bg='#ffffff')
         button_frame.pack(pady=20)
         
-        register_btn = tk.Button(button_frame, text="Register Account", 
-                               font=('Segoe UI', 12, 'bold'),
+        self._register_btn = tk.Button(button_frame, text="Register Account", 
+                               font=self._fonts['h3'],
                                bg='#28a745', fg='white',
                                command=self.process_registration,
                                width=18, height=2, relief='flat')
-        register_btn.pack(side='left', padx=10)
+        self._register_btn.pack(side='left', padx=10)
         
         back_btn = tk.Button(button_frame, text="Back to Login", 
-                           font=('Segoe UI', 11),
+                           font=self._fonts['body'],
                            bg='#6c757d', fg='white',
                            command=self.show_email_step,
                            width=15, height=2, relief='flat')
@@ -256,8 +333,9 @@ class EnterpriseLoginGUI:
         otp_label = ttk.Label(parent, text="Email Verification", style='Title.TLabel')
         otp_label.pack(pady=(0, 10))
         
-        desc_label = ttk.Label(parent, 
-                              text=f"Enter the 6-digit code sent to {getattr(self, 'current_email', 'your email')}", 
+        self.otp_desc_var = tk.StringVar(value="Enter the 6-digit code sent to your email")
+        desc_label = ttk.Label(parent,
+                              textvariable=self.otp_desc_var,
                               style='Subtitle.TLabel')
         desc_label.pack(pady=(0, 30))
         
@@ -266,42 +344,39 @@ class EnterpriseLoginGUI:
         otp_frame.pack(pady=20)
         
         tk.Label(otp_frame, text="Verification Code", 
-                font=('Segoe UI', 12, 'bold'), fg='#495057', bg='#ffffff').pack()
+                font=self._fonts['h3'], fg='#495057', bg='#ffffff').pack()
         
         self.otp_var = tk.StringVar()
         otp_entry = tk.Entry(otp_frame, textvariable=self.otp_var, 
-                            font=('Segoe UI', 16, 'bold'), width=15, 
+                            font=self._fonts['otp'], width=15, 
                             relief='solid', bd=2, justify='center')
         otp_entry.pack(pady=(10, 20), ipady=10)
-        otp_entry.focus()
-        
-        # Timer display
+        self._step_entries["otp"] = otp_entry
+
+        # Timer display; the countdown starts when the step is entered
         self.timer_label = ttk.Label(parent, text="", style='Subtitle.TLabel')
         self.timer_label.pack()
         
-        # Start countdown timer
-        self.start_otp_timer()
-        
         # Buttons
         button_frame = tk.Frame(parent, bg='#ffffff')
         button_frame.pack(pady=30)
         
-        verify_btn = tk.Button(button_frame, text="Verify & Login", 
-                              font=('Segoe UI', 12, 'bold'),
+        self._verify_btn = tk.Button(button_frame, text="Verify & Login", 
+                              font=self._fonts['h3'],
                               bg='#28a745', fg='white',
                               command=self.verify_otp,
                               width=15, height=2, relief='flat')
-        verify_btn.pack(side='left', padx=10)
+        self._verify_btn.pack(side='left', padx=10)
         
-        resend_btn = tk.Button(button_frame, text="Resend Code", 
-                              font=('Segoe UI', 11),
+        self._resend_btn = tk.Button(button_frame, text="Resend Code", 
+                              font=self._fonts['body'],
                               bg='#17a2b8', fg='white',
                               command=self.resend_otp,
                               width=12, height=2, relief='flat')
-        resend_btn.pack(side='left', padx=10)
+        self._resend_btn.pack(side='left', padx=10)
         
         back_btn = tk.Button(button_frame, text="Back", 
-                           font=('Segoe UI', 11),
+                           font=self._fonts['body'],
                            bg='#6c757d', fg='white',
                            command=self.show_email_step,
                            width=8, height=2, relief='flat')
@@ -322,13 +397,13 @@ class EnterpriseLoginGUI:
         
         welcome_text = f"Welcome back, {self.user_data.get('full_name', 'User')}!"
         welcome_label = tk.Label(welcome_frame, text=welcome_text, 
-                                font=('Segoe UI', 16, 'bold'), 
+                                font=self._fonts['otp'], 
                                 fg='#1f4e79', bg='#e8f4fd')
         welcome_label.pack(pady=15)
         
-        company_info = f"{self.user_data.get('department', 'Department')} • {self.user_data.get('company_domain', 'Company').upper()}"
+        company_info = f"{self.user_data.get('department', 'Department')} • {self._company_domain_upper}"
         company_label = tk.Label(welcome_frame, text=company_info, 
-                                font=('Segoe UI', 11), 
+                                font=self._fonts['body'], 
                                 fg='#6c757d', bg='#e8f4fd')
         company_label.pack(pady=(0, 15))
         
@@ -342,7 +417,7 @@ class EnterpriseLoginGUI:
         
         # Voice Recording button
         record_btn = tk.Button(btn_frame, text="🎙️ Start Voice Recording", 
-                              font=('Segoe UI', 14, 'bold'),
+                              font=self._fonts['feature'],
                               bg='#1f4e79', fg='white',
                               command=self.start_voice_recording,
                               width=25, height=3, relief='flat')
@@ -350,7 +425,7 @@ class EnterpriseLoginGUI:
         
         # Quick Email button
         quick_btn = tk.Button(btn_frame, text="📧 Generate Quick Email", 
-                             font=('Segoe UI', 12),
+                             font=self._fonts['body12'],
                              bg='#28a745', fg='white',
                              command=self.generate_quick_email,
                              width=25, height=2, relief='flat')
@@ -358,7 +433,7 @@ class EnterpriseLoginGUI:
         
         # User settings button
         settings_btn = tk.Button(btn_frame, text="⚙️ User Settings", 
-                               font=('Segoe UI', 12),
+                               font=self._fonts['body12'],
                                bg='#6c757d', fg='white',
                                command=self.show_user_settings,
                                width=25, height=2, relief='flat')
@@ -366,12 +441,12 @@ class EnterpriseLoginGUI:
         
         # Status area
         status_frame = tk.LabelFrame(features_frame, text="System Status", 
-                                   font=('Segoe UI', 11, 'bold'),
+                                   font=self._fonts['h4'],
                                    bg='#ffffff', fg='#1f4e79')
         status_frame.pack(fill='x', pady=20)
         
         self.main_status_label = tk.Label(status_frame, text="System ready. Click 'Start Voice Recording' to begin.", 
-                                         font=('Segoe UI', 10), 
+                                         font=self._fonts['small'], 
                                          fg='#28a745', bg='#ffffff')
         self.main_status_label.pack(pady=10)
         
@@ -379,14 +454,14 @@ class EnterpriseLoginGUI:
         session_frame = tk.Frame(parent, bg='#f8f9fa', relief='solid', bd=1)
         session_frame.pack(fill='x', pady=(20, 0))
         
-        session_info = f"Session expires: {datetime.fromisoformat(self.user_data['session_expires']).strftime('%I:%M %p')}"
+        session_info = f"Session expires: {self._session_expires_dt.strftime('%I:%M %p')}"
         session_label = tk.Label(session_frame, text=session_info, 
-                                font=('Segoe UI', 9), 
+                                font=self._fonts['tiny'], 
                                 fg='#6c757d', bg='#f8f9fa')
         session_label.pack(side='left', padx=15, pady=8)
         
         logout_btn = tk.Button(session_frame, text="Logout", 
-                              font=('Segoe UI', 9),
+                              font=self._fonts['tiny'],
                               bg='#dc3545', fg='white',
                               command=self.logout_user,
                               relief='flat')
@@ -402,25 +477,35 @@ class EnterpriseLoginGUI:
         if not email:
             self.status_label.config(text="Please enter your email address", foreground='#dc3545')
             return
+
+        if not email.endswith(_ALLOWED_DOMAINS):
+            self.status_label.config(text="Email domain not permitted", foreground='#dc3545')
+            return
         
         # Show loading
         self.status_label.config(text="Generating verification code...", foreground='#1f4e79')
-        self.root.update()
+        self.root.update_idletasks()
         
+        self._continue_btn.config(state='disabled')
+
         def generate_otp_async():
             result = self.auth.generate_otp(email)
             
             self.root.after(0, lambda: self.handle_otp_result(result, email))
         
-        threading.Thread(target=generate_otp_async, daemon=True).start()
+        self._pool.submit(generate_otp_async)
     
     def handle_otp_result(self, result, email):
         """Handle OTP generation result"""
+        self._continue_btn.config(state='normal')
         if result['success']:
             self.current_email = email
+            self.otp_desc_var.set(f"Enter the 6-digit code sent to {email}")
+            self.otp_var.set("")
             self.current_step = "otp"
             self.create_login_interface()
-            
+            self.start_otp_timer()
+
             # Show OTP file location for development
             messagebox.showinfo("Development Mode", 
                               f"OTP sent! Check 'otp_emails/' folder for the code.\n\n"
@@ -435,6 +520,7 @@ class EnterpriseLoginGUI:
     
     def show_email_step(self):
         """Show email input step"""
+        self.cancel_otp_timer()
         self.current_step = "email"
         self.create_login_interface()
     
@@ -447,18 +533,25 @@ class EnterpriseLoginGUI:
         if not all([email, name, dept]):
             self.reg_status_label.config(text="Please fill in all required fields", foreground='#dc3545')
             return
+
+        if not email.endswith(_ALLOWED_DOMAINS):
+            self.reg_status_label.config(text="Email domain not permitted", foreground='#dc3545')
+            return
         
         self.reg_status_label.config(text="Creating account...", foreground='#1f4e79')
-        self.root.update()
+        self.root.update_idletasks()
         
+        self._register_btn.config(state='disabled')
+
         def register_async():
             result = self.auth.register_user(email, name, dept)
             self.root.after(0, lambda: self.handle_registration_result(result, email))
         
-        threading.Thread(target=register_async, daemon=True).start()
+        self._pool.submit(register_async)
     
     def handle_registration_result(self, result, email):
         """Handle registration result"""
+        self._register_btn.config(state='normal')
         if result['success']:
             messagebox.showinfo("Registration Successful", 
                               f"{result['message']}\n\nYou can now login with your email.")
@@ -476,24 +569,35 @@ class EnterpriseLoginGUI:
             return
         
         self.otp_status_label.config(text="Verifying code...", foreground='#1f4e79')
-        self.root.update()
+        self.root.update_idletasks()
         
+        self._verify_btn.config(state='disabled')
+
         def verify_async():
             result = self.auth.verify_otp(self.current_email, otp_code)
             self.root.after(0, lambda: self.handle_login_result(result))
         
-        threading.Thread(target=verify_async, daemon=True).start()
+        self._pool.submit(verify_async)
     
     def handle_login_result(self, result):
         """Handle login verification result"""
+        self._verify_btn.config(state='normal')
         if result['success']:
             self.session_token = result['session_token']
             self.user_data = result['user_data']
-            
+            self._session_expires_dt = datetime.fromisoformat(self.user_data['session_expires'])
+
+            # Derive the company strings once; the UI re-reads them on every
+            # rebuild and email generation
+            domain = self.user_data['company_domain']
+            self._company_domain_upper = domain.upper()
+            self._company_short = domain.split('.', 1)[0].upper()
+            self._company_name = self._company_short + ' Medicine'
+
             messagebox.showinfo("Login Successful", 
                               f"Welcome to Laude Agent Enterprise!\n\n"
                               f"User: {self.user_data['full_name']}\n"
-                              f"Company: {self.user_data['company_domain'].upper()}")
+                              f"Company: {self._company_domain_upper}")
             
             self.current_step = "main_app"
             self.root.geometry("900x700")  # Larger window for main app
@@ -505,16 +609,19 @@ class EnterpriseLoginGUI:
         """Resend OTP code"""
         if hasattr(self, 'current_email'):
             self.otp_status_label.config(text="Sending new code...", foreground='#1f4e79')
-            self.root.update()
+            self.root.update_idletasks()
             
+            self._resend_btn.config(state='disabled')
+
             def resend_async():
                 result = self.auth.generate_otp(self.current_email)
                 self.root.after(0, lambda: self.handle_resend_result(result))
             
-            threading.Thread(target=resend_async, daemon=True).start()
+            self._pool.submit(resend_async)
     
     def handle_resend_result(self, result):
         """Handle OTP resend result"""
+        self._resend_btn.config(state='normal')
         if result['success']:
             self.otp_status_label.config(text="New verification code sent!", foreground='#28a745')
             self.start_otp_timer()  # Restart timer
@@ -524,45 +631,72 @@ class EnterpriseLoginGUI:
     
     def start_otp_timer(self):
         """Start OTP countdown timer"""
-        self.otp_expiry = datetime.now() + timedelta(minutes=10)  # 10 minutes
+        self.cancel_otp_timer()
+        self._otp_deadline = time.monotonic() + 600  # 10 minutes
         self.update_timer()
-    
+
+    def cancel_otp_timer(self):
+        """Cancel a pending countdown tick so resends don't stack timers"""
+        if self._timer_job is not None:
+            self.root.after_cancel(self._timer_job)
+            self._timer_job = None
+
     def update_timer(self):
         """Update countdown timer display"""
-        if hasattr(self, 'otp_expiry'):
-            remaining = self.otp_expiry - datetime.now()
-            
-            if remaining.total_seconds() > 0:
-                minutes = int(remaining.total_seconds() // 60)
-                seconds = int(remaining.total_seconds() % 60)
+        if self._otp_deadline is not None:
+            remaining = self._otp_deadline - time.monotonic()
+
+            if remaining > 0:
+                minutes, seconds = divmod(int(remaining), 60)
                 self.timer_label.config(text=f"Code expires in: {minutes:02d}:{seconds:02d}")
-                
-                # Schedule next update
-                self.root.after(1000, self.update_timer)
+
+                # Schedule the next tick on the following second boundary so
+                # the display never drifts from the real deadline
+                delay = int((remaining * 1000) % 1000) or 1000
+                self._timer_job = self.root.after(delay, self.update_timer)
             else:
                 self.timer_label.config(text="Verification code expired", foreground='#dc3545')
+                self._timer_job = None
     
     def start_session_monitoring(self):
-        """Start monitoring session validity"""
-        def check_session():
-            if self.session_token:
-                result = self.auth.validate_session(self.session_token)
-                
-                if not result['success']:
-                    messagebox.showwarning("Session Expired", 
-                                         "Your session has expired. Please login again.")
-                    self.logout_user()
-                    return
-                
-                # Update user data
-                self.user_data = result['user_data']
-            
-            # Schedule next check (every 5 minutes)
-            self.session_check_job = self.root.after(300000, check_session)
-        
-        # Start monitoring
-        self.session_check_job = self.root.after(300000, check_session)
-    
+        """Schedule one validity check just before the known session expiry"""
+        if self.session_check_job:
+            self.root.after_cancel(self.session_check_job)
+            self.session_check_job = None
+
+        if self._session_expires_dt is None:
+            return
+
+        # Wake 30 seconds before the session lapses instead of polling the
+        # session store every five minutes for the whole session lifetime
+        ms = int((self._session_expires_dt - datetime.now()).total_seconds() * 1000) - 30000
+        self.session_check_job = self.root.after(max(1000, ms), self._on_session_near_expiry)
+
+    def _on_session_near_expiry(self):
+        """Revalidate once at the expiry boundary; logout or reschedule"""
+        self.session_check_job = None
+        if not self.session_token:
+            return
+
+        result = self.auth.validate_session(self.session_token)
+
+        if not result['success']:
+            messagebox.showwarning("Session Expired",
+                                 "Your session has expired. Please login again.")
+            self.logout_user()
+            return
+
+        self.user_data = result['user_data']
+        self._session_expires_dt = datetime.fromisoformat(self.user_data['session_expires'])
+
+        # Nothing extends sessions server-side, so a pass this close to
+        # the boundary only means the clock hasn't run out yet. Wake again
+        # when the expiry itself arrives - re-arming the -30s offset here
+        # would degenerate into once-a-second DB checks for the final
+        # stretch of every session
+        ms = int((self._session_expires_dt - datetime.now()).total_seconds() * 1000)
+        self.session_check_job = self.root.after(max(1000, ms), self._on_session_near_expiry)
+
     def logout_user(self):
         """Logout current user"""
         if self.session_token:
@@ -572,9 +706,19 @@ class EnterpriseLoginGUI:
         if self.session_check_job:
             self.root.after_cancel(self.session_check_job)
         
+        # Drop the per-user main-app frame now instead of carrying its
+        # widgets until the next login rebuilds it
+        if self.frames["main_app"] is not None:
+            self.frames["main_app"].destroy()
+            self.frames["main_app"] = None
+
         # Reset state
         self.session_token = None
         self.user_data = None
+        self._session_expires_dt = None
+        self._company_domain_upper = None
+        self._company_short = None
+        self._company_name = None
         self.current_step = "email"
         
         # Reset window size and show login
@@ -591,25 +735,20 @@ class EnterpriseLoginGUI:
     
     def generate_quick_email(self):
         """Generate a quick professional email"""
-        # Create sample content for demo
-        sample_transcript = f"""
-        This week at {self.user_data['company_domain'].split('.')[0].upper()} I completed several important tasks.
-        I worked on system improvements and collaborated with the team on various projects.
-        Performance was good this week and I maintained all operational standards.
-        Next week I'm planning to focus on new initiatives and continued development.
-        """
+        # Sample content for demo; with only two allowed companies the
+        # cache makes this a dict hit after the first click
+        sample_transcript = _sample_transcript(self._company_short)
         
         self.main_status_label.config(text="Generating professional email...", foreground='#1f4e79')
-        self.root.update()
+        self.root.update_idletasks()
         
         def generate_async():
             try:
-                company_name = self.user_data['company_domain'].split('.')[0].upper() + " Medicine"
-                
+                generate_professional_email = _import_email_generator()
                 email_content = generate_professional_email(
                     sample_transcript,
                     self.user_data['full_name'],
-                    company_name,
+                    self._company_name,
                     self.user_data['department']
                 )
                 
@@ -620,7 +759,7 @@ class EnterpriseLoginGUI:
                 self.root.after(0, lambda: self.main_status_label.config(
                     text="Email generation failed. Please try again.", foreground='#dc3545'))
         
-        threading.Thread(target=generate_async, daemon=True).start()
+        self._pool.submit(generate_async)
     
     def show_generated_email(self, email_content):
         """Show generated email in a new window"""
@@ -633,7 +772,7 @@ class EnterpriseLoginGUI:
             
             # Email content display
             text_widget = scrolledtext.ScrolledText(email_window, 
-                                                  font=('Consolas', 11),
+                                                  font=self._fonts['mono'],
                                                   bg='#ffffff', fg='#2c3e50',
                                                   relief='solid', bd=1)
             text_widget.pack(fill='both', expand=True, padx=20, pady=20)
@@ -646,14 +785,14 @@ class EnterpriseLoginGUI:
             btn_frame.pack(pady=10)
             
             copy_btn = tk.Button(btn_frame, text="Copy to Clipboard", 
-                               font=('Segoe UI', 11),
+                               font=self._fonts['body'],
                                bg='#28a745', fg='white',
                                command=lambda: self.copy_to_clipboard(email_content),
                                relief='flat')
             copy_btn.pack(side='left', padx=10)
             
             close_btn = tk.Button(btn_frame, text="Close", 
-                                font=('Segoe UI', 11),
+                                font=self._fonts['body'],
                                 bg='#6c757d', fg='white',
                                 command=email_window.destroy,
                                 relief='flat')
@@ -675,9 +814,14 @@ class EnterpriseLoginGUI:
                           f"User: {self.user_data['full_name']}\n"
                           f"Email: {self.user_data['email']}\n"
                           f"Department: {self.user_data['department']}\n"
-                          f"Company: {self.user_data['company_domain'].upper()}\n\n"
+                          f"Company: {self._company_domain_upper}\n\n"
                           f"Advanced settings coming soon!")
     
+    def _on_close(self):
+        """Shut down the worker pool before closing the window"""
+        self._pool.shutdown(wait=False)
+        self.root.destroy()
+
     def run(self):
         """Start the application"""
         try:
@@ -695,7 +839,7 @@ def main():
         # Create required directories
         directories = ["otp_emails", "logs", "emails", "reports", "transcripts", "audio_clips"]
         for directory in directories:
-            Path(directory).mkdir(exist_ok=True)
+            _ensure_dir(directory)
         
         # Initialize and run the enterprise GUI
         app = EnterpriseLoginGUI()
@@ -6,25 +6,60 @@ Click to run voice-to-email reporting system
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import threading
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import collections
+import time
 import os
 import sys
 import logging
+import logging.handlers
 from datetime import datetime
 from pathlib import Path
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from record_voice import record_multiple_clips, test_microphone
-    from merge_audio import merge_audio_clips
-    from transcribe_audio import transcribe_audio
-    from generate_report import generate_report
-    from generate_professional_email import generate_professional_email
-    from send_email_outlook import send_email_outlook_draft
-except ImportError as e:
-    print(f"Import error: {e}")
+# Directories already created in this process; repeat calls skip the
+# per-directory mkdir syscalls entirely
+_ensured_dirs = set()
+
+# Parsed user_config.txt, shared across app instances in this process so
+# reopening the GUI doesn't re-read the file
+_USER_CFG_CACHE = None
+
+def _ts():
+    """Wall-clock HH:MM:SS without the locale-aware strftime machinery"""
+    t = time.localtime()
+    return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+def ensure_dirs(dirs):
+    """Create any missing directories with a single scandir pass"""
+    need = set(dirs) - _ensured_dirs
+    if not need:
+        return
+    existing = {e.name for e in os.scandir('.') if e.is_dir()}
+    for d in need - existing:
+        os.mkdir(d)
+    _ensured_dirs.update(need)
+
+# The audio/AI stack (sounddevice, OpenAI SDK, pywin32) is imported
+# inside the handlers that need it, not here, so the window paints
+# before any of it loads.
+
+class _TkTextHandler(logging.Handler):
+    """Mirror log records into the GUI's coalesced log queue"""
+    
+    def __init__(self, app):
+        super().__init__()
+        self._app = app
+    
+    def emit(self, record):
+        try:
+            self._app._queue_log_line(
+                f"[{_ts()}] {record.levelname}: {record.getMessage()}\n")
+        except Exception:
+            self.handleError(record)
 
 class WeeklyReportApp:
     def __init__(self, root):
@@ -33,6 +68,15 @@ class WeeklyReportApp:
         self.root.geometry("900x700")
         self.root.configure(bg='#f0f0f0')
         
+        # One reused worker pool for the recording/demo/mic jobs instead of
+        # a fresh daemon thread per click
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="laude")
+
+        # Pending GUI log lines, drained in one insert per ~50 ms tick
+        # instead of an insert + idle-task flush per line
+        self._log_q = collections.deque()
+        self._drain_scheduled = False
+
         # Variables
         self.is_recording = False
         self.audio_files = []
@@ -54,29 +98,50 @@ class WeeklyReportApp:
     
     def load_user_info(self):
         """Load user information from config file"""
+        global _USER_CFG_CACHE
+        if _USER_CFG_CACHE is not None:
+            self.user_name = _USER_CFG_CACHE['name']
+            self.user_email = _USER_CFG_CACHE['email']
+            self.user_company = _USER_CFG_CACHE['company']
+            self.user_department = _USER_CFG_CACHE['department']
+            return True
+
+        # Open directly instead of exists()-then-open: one stat, not two,
+        # and a missing file is the expected first-run case
         try:
-            config_file = Path("user_config.txt")
-            if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    if len(lines) >= 4:
-                        self.user_name = lines[0].strip()
-                        self.user_email = lines[1].strip()
-                        self.user_company = lines[2].strip()
-                        self.user_department = lines[3].strip()
-                        return True
+            with open("user_config.txt", 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return False
         except Exception:
-            pass
+            return False
+
+        if len(lines) >= 4:
+            self.user_name = lines[0].strip()
+            self.user_email = lines[1].strip()
+            self.user_company = lines[2].strip()
+            self.user_department = lines[3].strip()
+            _USER_CFG_CACHE = {
+                'name': self.user_name,
+                'email': self.user_email,
+                'company': self.user_company,
+                'department': self.user_department
+            }
+            return True
         return False
     
     def save_user_info(self):
         """Save user information to config file"""
+        global _USER_CFG_CACHE
         try:
-            with open("user_config.txt", 'w', encoding='utf-8') as f:
-                f.write(f"{self.user_name}\n")
-                f.write(f"{self.user_email}\n")
-                f.write(f"{self.user_company}\n")
-                f.write(f"{self.user_department}\n")
+            data = f"{self.user_name}\n{self.user_email}\n{self.user_company}\n{self.user_department}\n"
+            Path("user_config.txt").write_text(data, encoding='utf-8')
+            _USER_CFG_CACHE = {
+                'name': self.user_name,
+                'email': self.user_email,
+                'company': self.user_company,
+                'department': self.user_department
+            }
             return True
         except Exception:
             return False
@@ -275,39 +340,65 @@ class WeeklyReportApp:
     def setup_logging(self):
         """Setup logging to display in GUI"""
         
-        # Create logs directory
+        # Create logs directory (no-op if main() already made it)
+        ensure_dirs(["logs"])
         log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
         
         # Setup logging
         log_file = log_dir / f"gui_app_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[logging.FileHandler(log_file)]
-        )
-        
+
+        # Buffer records in memory and flush in batches; a raw handler pays
+        # one write per record, which adds up during pipeline bursts. The
+        # 128 KiB stream buffer (vs the 8 KiB default) batches the flushes
+        # into far fewer write syscalls.
+        fh = logging.StreamHandler(open(log_file, 'a', buffering=131072, encoding='utf-8'))
+        fh.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self._mem_handler = logging.handlers.MemoryHandler(
+            1024, flushLevel=logging.ERROR, target=fh)
+
+        logging.basicConfig(level=logging.INFO, handlers=[self._mem_handler])
+        atexit.register(self._mem_handler.flush)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
         self.logger = logging.getLogger(__name__)
+
+        # The GUI display is just another handler, so each message is
+        # formatted and dispatched once rather than once per output path
+        self.logger.addHandler(_TkTextHandler(self))
+
+    def _on_close(self):
+        """Flush buffered log records and stop the pool before closing"""
+        self._pool.shutdown(wait=False)
+        self._mem_handler.flush()
+        self.root.destroy()
         
     def log_message(self, message, level="INFO"):
-        """Add message to log display"""
-        
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        log_entry = f"[{timestamp}] {level}: {message}\n"
+        """Log a message; handlers fan it out to the display and the file"""
         
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
-        
-        # Also log to file
-        if level == "INFO":
-            self.logger.info(message)
-        elif level == "ERROR":
+        if level == "ERROR":
             self.logger.error(message)
         elif level == "WARNING":
             self.logger.warning(message)
+        else:
+            self.logger.info(message)
     
+    def _queue_log_line(self, line):
+        """Queue a log line for the next coalesced display update"""
+        self._log_q.append(line)
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.root.after(50, self._drain_log)
+
+    def _drain_log(self):
+        """Insert every pending log line in one text-widget operation"""
+        self._drain_scheduled = False
+        batch = []
+        while self._log_q:
+            batch.append(self._log_q.popleft())
+        if batch:
+            self.log_text.insert(tk.END, ''.join(batch))
+            self.log_text.see(tk.END)
+
     def update_step_status(self, step_index, status="active"):
         """Update step indicator status"""
         
@@ -340,6 +431,8 @@ class WeeklyReportApp:
         
         def test_mic():
             try:
+                from record_voice import test_microphone
+
                 if test_microphone():
                     self.log_message("Microphone test successful!", "INFO")
                     self.status_label.configure(text="Microphone working correctly")
@@ -352,7 +445,7 @@ class WeeklyReportApp:
                 self.log_message(f"Microphone test error: {str(e)}", "ERROR")
                 messagebox.showerror("Error", f"Microphone test error: {str(e)}")
         
-        threading.Thread(target=test_mic, daemon=True).start()
+        self._pool.submit(test_mic)
     
     def start_recording(self):
         """Start the voice recording process"""
@@ -367,6 +460,10 @@ class WeeklyReportApp:
         
         def recording_process():
             try:
+                from generate_report import generate_report
+                from generate_professional_email import generate_professional_email
+                from send_email_outlook import send_email_outlook_draft
+
                 # Step 1: Record voice
                 self.update_step_status(0, "active")
                 self.status_label.configure(text="Recording your voice...")
@@ -379,10 +476,6 @@ class WeeklyReportApp:
                     "The recording will stop automatically after 60 seconds,\n" +
                     "or you can close this dialog early to stop.")
                 
-                # Simulate recording (in real version, this would be actual recording)
-                import time
-                time.sleep(2)  # Simulate recording time
-                
                 # For demo, use sample transcript
                 self.transcript = """
                 This week at HHA Medicine I completed several important projects.
@@ -400,7 +493,6 @@ class WeeklyReportApp:
                 self.update_step_status(2, "active")
                 self.status_label.configure(text="AI transcribing your voice...")
                 self.log_message("Transcribing with OpenAI Whisper")
-                time.sleep(3)
                 self.update_step_status(2, "completed")
                 
                 # Step 4: Generate report
@@ -463,7 +555,7 @@ class WeeklyReportApp:
                 self.main_button.configure(text="🎙️ Start Recording", state='normal')
                 self.progress.stop()
         
-        threading.Thread(target=recording_process, daemon=True).start()
+        self._pool.submit(recording_process)
     
     def create_fallback_email(self):
         """Create fallback email if AI generation fails"""
@@ -495,71 +587,81 @@ Note: This is a fallback email. For detailed updates, please use voice recording
         
         self.log_message("Running demo mode")
         
-        # Simulate the full process quickly
+        # Animate the step indicators from the Tk thread; after() folds the
+        # transitions into the normal event cadence, so the animation needs
+        # no worker thread, no sleeps, and redraws once per step
         self.reset_steps()
+        for i in range(len(self.steps)):
+            self.root.after(i * 1000, lambda i=i: self._demo_step(i))
         
-        def demo_process():
-            try:
-                for i in range(5):
-                    self.update_step_status(i, "active")
-                    self.status_label.configure(text=f"Demo: {self.steps[i]}")
-                    self.log_message(f"Demo step: {self.steps[i]}")
-                    
-                    import time
-                    time.sleep(1)
-                    
-                    self.update_step_status(i, "completed")
-                
-                # Generate actual report in demo
-                demo_transcript = """
-                Demo week at HHA Medicine: completed patient system integration,
-                implemented security protocols, trained staff on new features,
-                maintained 99.7% uptime, planning mobile app launch next week.
-                """
-                
-                self.report_html = generate_report(demo_transcript)
-                
-                # Generate professional email using universal prompt
-                professional_email = generate_professional_email(
-                    demo_transcript, 
-                    self.user_name, 
-                    self.user_company, 
-                    self.user_department
-                )
-                
-                if not professional_email:
-                    professional_email = self.create_fallback_email()
-                
-                combined_content = f"{professional_email}\n\n--- DETAILED REPORT ---\n{self.report_html}"
-                
-                subject = f"DEMO - Weekly Update - {datetime.now().strftime('%B %d, %Y')} - {self.user_name}"
-                
-                if send_email_outlook_draft(combined_content, subject):
-                    self.status_label.configure(text="Demo complete! Check Outlook")
-                    self.log_message("Demo completed successfully - Outlook draft created")
-                    
-                    messagebox.showinfo("Demo Complete!", 
-                        f"Demo completed successfully!\n\n" +
-                        f"✓ All systems tested\n" +
-                        f"✓ Professional email created for {self.user_name}\n" +
-                        f"✓ Universal prompt system working\n" +
-                        f"✓ Ready for real voice recording\n\n" +
-                        "Check Outlook for demo email!")
-                else:
-                    self.log_message("Demo completed - email creation had issues", "WARNING")
+        self.root.after(len(self.steps) * 1000, self._finish_demo_steps)
+    
+    def _demo_step(self, i):
+        """Advance the demo step indicators (runs on the Tk thread)"""
+        if i > 0:
+            self.update_step_status(i - 1, "completed")
+        self.update_step_status(i, "active")
+        self.status_label.configure(text=f"Demo: {self.steps[i]}")
+        self.log_message(f"Demo step: {self.steps[i]}")
+    
+    def _finish_demo_steps(self):
+        """Complete the animation and hand generation to the pool"""
+        self.update_step_status(len(self.steps) - 1, "completed")
+        self._pool.submit(self._demo_generate)
+    
+    def _demo_generate(self):
+        """Generate the demo report and email off the Tk thread"""
+        try:
+            from generate_report import generate_report
+            from generate_professional_email import generate_professional_email
+            from send_email_outlook import send_email_outlook_draft
+
+            # Generate actual report in demo
+            demo_transcript = """
+            Demo week at HHA Medicine: completed patient system integration,
+            implemented security protocols, trained staff on new features,
+            maintained 99.7% uptime, planning mobile app launch next week.
+            """
             
-            except Exception as e:
-                self.log_message(f"Demo error: {str(e)}", "ERROR")
-        
-        threading.Thread(target=demo_process, daemon=True).start()
+            self.report_html = generate_report(demo_transcript)
+            
+            # Generate professional email using universal prompt
+            professional_email = generate_professional_email(
+                demo_transcript, 
+                self.user_name, 
+                self.user_company, 
+                self.user_department
+            )
+            
+            if not professional_email:
+                professional_email = self.create_fallback_email()
+            
+            combined_content = f"{professional_email}\n\n--- DETAILED REPORT ---\n{self.report_html}"
+            
+            subject = f"DEMO - Weekly Update - {datetime.now().strftime('%B %d, %Y')} - {self.user_name}"
+            
+            if send_email_outlook_draft(combined_content, subject):
+                self.status_label.configure(text="Demo complete! Check Outlook")
+                self.log_message("Demo completed successfully - Outlook draft created")
+                
+                messagebox.showinfo("Demo Complete!", 
+                    f"Demo completed successfully!\n\n" +
+                    f"✓ All systems tested\n" +
+                    f"✓ Professional email created for {self.user_name}\n" +
+                    f"✓ Universal prompt system working\n" +
+                    f"✓ Ready for real voice recording\n\n" +
+                    "Check Outlook for demo email!")
+            else:
+                self.log_message("Demo completed - email creation had issues", "WARNING")
+        
+        except Exception as e:
+            self.log_message(f"Demo error: {str(e)}", "ERROR")
 
 def main():
     """Main application entry point"""
     
     # Setup directories
-    directories = ["audio_clips", "reports", "transcripts", "logs", "templates"]
-    for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
+    ensure_dirs(["audio_clips", "reports", "transcripts", "logs", "templates"])
     
     # Create and run GUI
     root = tk.Tk()
@@ -18,29 +18,36 @@ def record_audio_clip(filename, sample_rate=44100):
     print(f"MICROPHONE Recording {filename}...")
     print("   Press ENTER to stop recording")
     
-    # Start recording
-    recording = []
-    
+    # Start recording; keep whole float32 blocks and track the running
+    # peak in the callback, so no sample is ever boxed into a Python
+    # object and the peak needs no extra pass afterwards
+    chunks = []
+    peak = 0.0
+
     def audio_callback(indata, frames, time, status):
+        nonlocal peak
         if status:
             logger.warning(f"Audio callback status: {status}")
-        recording.extend(indata[:, 0])  # Mono recording
-    
+        mono = indata[:, 0].copy()  # Mono recording; the driver reuses indata
+        chunks.append(mono)
+        block_peak = float(np.max(np.abs(mono)))
+        if block_peak > peak:
+            peak = block_peak
+
     try:
         with sd.InputStream(samplerate=sample_rate, channels=1, callback=audio_callback):
             input()  # Wait for user to press Enter
-        
-        if not recording:
+
+        if not chunks:
             print("CROSS No audio recorded")
             return None
-        
-        # Convert to numpy array and save as WAV
-        audio_data = np.array(recording, dtype=np.float32)
-        
-        # Normalize audio
-        if np.max(np.abs(audio_data)) > 0:
-            audio_data = audio_data / np.max(np.abs(audio_data))
-        
+
+        # One concatenation, then normalize with the peak tracked during
+        # capture - no extra full scan over the recording
+        audio_data = np.concatenate(chunks)
+        if peak > 0:
+            audio_data /= np.float32(peak)
+
         # Convert to 16-bit integers
         audio_data_int = (audio_data * 32767).astype(np.int16)
         